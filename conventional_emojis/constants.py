@@ -1,3 +1,5 @@
+import re
+
 COMMIT_TYPES: dict[str, str] = {
     "feat": "✨",
     "fix": "🐛",
@@ -13,5 +15,16 @@ COMMIT_TYPES: dict[str, str] = {
     "wip": "🚧",
 }
 BREAKING: str = "💥"
-BASE_PATTERN: str = r"^(?P<type>\w+)(\((?P<scope>.+)\))?(?P<breaking>!)?:"
+BASE_PATTERN: str = r"^(?P<type>\w+)(?:\((?P<scope>[^)]+)\))?(?P<breaking>!)?:"
+BASE_REGEX: re.Pattern[str] = re.compile(BASE_PATTERN)
 COMMIT_MESSAGE_TEMPLATE = "{conventional_prefix} {breaking_emoji}{type_emoji}{scope_emoji} {description}\n{body}"
+TEMPLATE_FIELDS: frozenset[str] = frozenset(
+    {
+        "conventional_prefix",
+        "description",
+        "breaking_emoji",
+        "type_emoji",
+        "scope_emoji",
+        "body",
+    },
+)
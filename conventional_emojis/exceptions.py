@@ -1,41 +1,59 @@
-from dataclasses import dataclass
+from collections.abc import Iterable
 
 
-@dataclass
-class NonConventionalCommitError(Exception):
-    """Raised when a commit message doesn't follow the Conventional Commits format."""
+class ConventionalEmojisError(Exception):
+    """Base class of all errors, falling back to a class-level default message."""
 
-    message: str = "Commit message does not follow Conventional Commits rules."
+    message: str = "Conventional emojis error."
+
+    def __init__(self, message: str | None = None) -> None:
+        if message is not None:
+            self.message = message
+        super().__init__(self.message)
 
     def __str__(self) -> str:
         return self.message
 
 
-@dataclass
-class NoConventionalCommitTypeFoundError(Exception):
-    """Raised when type in the commit message is not found in the commit types."""
+class NonConventionalCommitError(ConventionalEmojisError):
+    """Raised when a commit message doesn't follow the Conventional Commits format."""
 
-    message: str = "Commit type not found in the commit types."
+    message: str = "Commit message does not follow Conventional Commits rules."
 
-    def __str__(self) -> str:
-        return self.message
 
+class NoConventionalCommitTypeFoundError(ConventionalEmojisError):
+    """Raised when type in the commit message is not found in the commit types.
+
+    Given the commit type, the message lists the available types in the given
+    order.
+    """
 
-@dataclass
-class InvalidCommitTemplateError(Exception):
+    message: str = "Commit type not found in the commit types."
+
+    def __init__(
+        self,
+        message: str | None = None,
+        *,
+        commit_type: str = "",
+        types: Iterable[str] = (),
+    ) -> None:
+        self.commit_type = commit_type
+        self.types = tuple(types)
+        if message is None and commit_type:
+            message = (
+                f"Commit type '{commit_type}' does not have a corresponding emoji.\n"
+                f"Available types are: {', '.join(self.types)}"
+            )
+        super().__init__(message)
+
+
+class InvalidCommitTemplateError(ConventionalEmojisError):
     """Raised when the commit template is invalid."""
 
     message: str = "Invalid commit template."
 
-    def __str__(self) -> str:
-        return self.message
-
 
-@dataclass
-class UndefinedScopeError(Exception):
+class UndefinedScopeError(ConventionalEmojisError):
     """Raised when a scope doesn't match any defined patterns when enforcement is enabled."""
 
     message: str = "Scope does not match any defined patterns in the configuration."
-
-    def __str__(self) -> str:
-        return self.message
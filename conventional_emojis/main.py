@@ -1,28 +1,44 @@
 #!/usr/bin/env python3
 
-import argparse
+import contextlib
+import os
 import re
 import sys
+from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
+from string import Formatter
+from typing import Any, NoReturn
 
 import msgspec
 
 from conventional_emojis.constants import (
-    BASE_PATTERN,
+    BASE_REGEX,
     BREAKING,
     COMMIT_MESSAGE_TEMPLATE,
     COMMIT_TYPES,
+    TEMPLATE_FIELDS,
 )
 from conventional_emojis.exceptions import (
+    ConventionalEmojisError,
     InvalidCommitTemplateError,
     NoConventionalCommitTypeFoundError,
     NonConventionalCommitError,
     UndefinedScopeError,
 )
 
+# Commit message "file" that stands for piping the message through stdin/stdout
+STDIN = Path("-")
 
-@dataclass
+# Set to a non-empty value to skip looking for a config file altogether
+NO_CONFIG_ENV_VAR = "CONVENTIONAL_EMOJIS_NO_CONFIG"
+
+# Literal text, field name and optional format string of one template field
+TemplatePart = tuple[str, str | None, str | None]
+
+
+@dataclass(slots=True, frozen=True)
 class CommitMessageDetails:
     conventional_prefix: str
     description: str
@@ -32,26 +48,172 @@ class CommitMessageDetails:
     breaking: bool
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Emojis:
     type_emoji: str
     scope_emoji: str
     breaking_emoji: str
 
 
-class Config(msgspec.Struct, forbid_unknown_fields=True):
+class Config(msgspec.Struct, forbid_unknown_fields=True, frozen=True):
     breaking_emoji: str = BREAKING
     commit_message_template: str = COMMIT_MESSAGE_TEMPLATE
 
 
-class ConventionalEmojisConfig(msgspec.Struct, forbid_unknown_fields=True):
+def _is_literal(pattern: str) -> bool:
+    """Whether a pattern contains no regex syntax and only matches itself."""
+    return re.escape(pattern) == pattern
+
+
+@dataclass(slots=True, frozen=True)
+class PatternMatcher:
+    """Scope or combo patterns matched by dict lookup and a single fused regex.
+
+    Patterns without any regex syntax (plain names like ``api``) are looked up
+    in a dict. All other patterns are fused into one alternation, each wrapped
+    in a capturing group so ``Match.lastindex`` tells which pattern matched.
+    The first matching pattern in configuration order wins, exactly like
+    checking the patterns one by one. Patterns with capturing groups of their
+    own (which would clash with or shift the wrapping groups) are matched one
+    by one instead of being fused.
+    """
+
+    emojis: list[str]
+    literals: dict[str, int]
+    regex: re.Pattern[str] | None
+    patterns: list[tuple[int, re.Pattern[str]]]
+    first_pattern_index: int
+
+    @classmethod
+    def from_patterns(cls, patterns: Mapping[str, str]) -> "PatternMatcher":
+        literals = {}
+        compiled = []
+        for index, pattern in enumerate(patterns):
+            if _is_literal(pattern):
+                literals[sys.intern(pattern)] = index
+            else:
+                compiled.append((index, re.compile(pattern)))
+
+        regex = None
+        if compiled and all(pattern.groups == 0 for _, pattern in compiled):
+            # e.g. inline global flags like "(?i)" are only valid at the very start
+            with contextlib.suppress(re.error):
+                regex = re.compile(
+                    "|".join(f"({pattern.pattern})" for _, pattern in compiled),
+                )
+        return cls(
+            emojis=list(patterns.values()),
+            literals=literals,
+            regex=regex,
+            patterns=compiled,
+            first_pattern_index=compiled[0][0] if compiled else len(patterns),
+        )
+
+    def _match_pattern(self, scope: str) -> int | None:
+        if self.regex is not None:
+            match = self.regex.fullmatch(scope)
+            # Group n wraps the n-th regex pattern
+            return self.patterns[match.lastindex - 1][0] if match else None
+        for index, pattern in self.patterns:
+            if pattern.fullmatch(scope):
+                return index
+        return None
+
+    def match(self, scope: str) -> str | None:
+        """Return the emoji of the first pattern fully matching the scope."""
+        index = self.literals.get(scope)
+        # Regex patterns only need to run if one of them comes before the literal
+        if index is None or index > self.first_pattern_index:
+            pattern_index = self._match_pattern(scope)
+            if pattern_index is not None and (index is None or pattern_index < index):
+                index = pattern_index
+        return None if index is None else self.emojis[index]
+
+
+# Signature shared by get_emojis and get_type_emojis
+EmojiResolver = Callable[..., Emojis]
+
+
+class ReadOnlyDict(dict[str, Any]):
+    """A dict that cannot be modified after it is created.
+
+    Being a real dict, it is still encoded by msgspec like any other dict, and
+    it pickles and copies as a new read-only dict.
+    """
+
+    def _read_only(self, *_args: object, **_kwargs: object) -> NoReturn:
+        msg = f"{type(self).__name__} does not support item assignment"
+        raise TypeError(msg)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> tuple[type["ReadOnlyDict"], tuple[dict[str, Any]]]:
+        return type(self), (dict(self),)
+
+    def __copy__(self) -> "ReadOnlyDict":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, object]) -> "ReadOnlyDict":
+        return self
+
+
+class ConventionalEmojisConfig(
+    msgspec.Struct,
+    forbid_unknown_fields=True,
+    frozen=True,
+    dict=True,  # allows caching the compiled patterns on the instance
+):
+    """Emoji mappings and settings, read-only once loaded.
+
+    The patterns are compiled from ``scopes`` and ``combos`` only once, so the
+    config is frozen and ``from_toml`` stores all mappings as ``ReadOnlyDict``.
+    To change a config, load a new one (or build one with
+    ``msgspec.structs.replace``) instead of modifying it in place. When
+    constructing an instance directly, pass mappings that are not modified
+    afterwards.
+    """
+
     types: dict[str, str] = msgspec.field(
-        default_factory=lambda: dict(COMMIT_TYPES),
+        default_factory=lambda: ReadOnlyDict(COMMIT_TYPES),
     )
     scopes: dict[str, str] | None = None
     combos: dict[str, dict[str, str]] | None = None
     config: Config = msgspec.field(default_factory=Config)
 
+    @cached_property
+    def compiled_scopes(self) -> PatternMatcher | None:
+        """Scope patterns compiled once, on first use."""
+        return (
+            None if self.scopes is None else PatternMatcher.from_patterns(self.scopes)
+        )
+
+    @cached_property
+    def compiled_combos(self) -> dict[str, PatternMatcher]:
+        """Combo patterns per commit type compiled once, on first use."""
+        if not self.combos:
+            return {}
+        return {
+            sys.intern(commit_type): PatternMatcher.from_patterns(patterns)
+            for commit_type, patterns in self.combos.items()
+        }
+
+    @cached_property
+    def sorted_type_names(self) -> tuple[str, ...]:
+        """Type names in the order listed by errors, sorted once on first use."""
+        return tuple(sorted(self.types))
+
+    @cached_property
+    def emoji_resolver(self) -> EmojiResolver:
+        """Emoji lookup specialized for this config, chosen once on first use.
+
+        Without scopes and combos only the type emoji can ever be set, so the
+        pattern checks of ``get_emojis`` are skipped entirely.
+        """
+        if self.scopes is None and not self.combos:
+            return get_type_emojis
+        return get_emojis
+
     @classmethod
     def from_toml(
         cls,
@@ -74,78 +236,165 @@ class ConventionalEmojisConfig(msgspec.Struct, forbid_unknown_fields=True):
 
         Raises:
             msgspec.ValidationError: If TOML content is invalid
+            InvalidCommitTemplateError: If the commit message template is malformed
         """
-        # Create default instance (to be used if no TOML content is provided)
+        # Share one prebuilt default instance in the common case without any
+        # custom configuration (safe, since configs are read-only)
+        if (
+            not toml_content
+            and template_override is None
+            and default_commit_types is COMMIT_TYPES
+            and cls is ConventionalEmojisConfig
+        ):
+            return DEFAULT_CONFIG
+
+        # Use the defaults if no TOML content is provided
         if not toml_content:
-            instance = cls(types=default_commit_types)
-        elif toml_content:
+            # Copy, so the config never shares the module defaults
+            types = dict(default_commit_types)
+            scopes, combos, config = None, None, Config()
+        else:
             try:
-                if isinstance(toml_content, bytes | bytearray):
-                    toml_content = toml_content.decode("utf-8")
-                instance = msgspec.toml.decode(toml_content, type=cls)
+                # msgspec decodes bytes itself, no need to decode them up front
+                loaded = msgspec.toml.decode(toml_content, type=cls)
             except msgspec.ValidationError as e:
                 msg = f"Error parsing custom rules TOML content: {e}"
                 raise msgspec.ValidationError(msg) from None
 
-            # Merge types from config file with default types
-            types = dict(default_commit_types)
-            types.update(instance.types)
-            instance.types = types
+            # Merge types from config file with default types into a new dict,
+            # interning the keys like the parsed commit types they are looked up by
+            types = default_commit_types | {
+                sys.intern(commit_type): emoji
+                for commit_type, emoji in loaded.types.items()
+            }
+            scopes, combos, config = loaded.scopes, loaded.combos, loaded.config
 
         # Apply template override if provided
         if template_override is not None:
-            instance.config.commit_message_template = template_override
+            config = msgspec.structs.replace(
+                config,
+                commit_message_template=template_override,
+            )
+
+        # Parse and validate the template once so every commit only fills it in
+        parse_template(config.commit_message_template)
 
         # Update scopes with types if allowed
-        if instance.scopes is not None and allow_types_as_scopes:
-            instance.scopes.update(instance.types)
+        if scopes is not None and allow_types_as_scopes:
+            scopes = scopes | types
+
+        # Read-only, so the compiled patterns can never go stale
+        instance = cls(
+            types=ReadOnlyDict(types),
+            scopes=None if scopes is None else ReadOnlyDict(scopes),
+            combos=None
+            if combos is None
+            else ReadOnlyDict(
+                {
+                    commit_type: ReadOnlyDict(patterns)
+                    for commit_type, patterns in combos.items()
+                },
+            ),
+            config=config,
+        )
+
+        # Compile the patterns and pick the emoji lookup once per config
+        _ = instance.compiled_scopes, instance.compiled_combos, instance.emoji_resolver
 
         return instance
 
 
-def load_toml_content(config_file: Path) -> str:
+# Built from a copy, so it never shares COMMIT_TYPES
+DEFAULT_CONFIG = ConventionalEmojisConfig()
+
+
+def load_toml_content(config_file: Path) -> bytes:
     """Load TOML content from a file.
 
     Args:
         config_file: Path to the TOML configuration file
 
     Returns:
-        str: Content of the TOML file if it exists, empty string if it doesn't
+        bytes: Raw content of the TOML file if it exists, empty bytes if it doesn't
 
     Note:
-        Returns empty string instead of None to maintain consistency with TOML format
-        and avoid additional None checks in the configuration parsing.
+        Returns empty bytes instead of None to maintain consistency with TOML format
+        and avoid additional None checks in the configuration parsing. The content
+        is not decoded here since msgspec accepts (UTF-8 encoded) bytes directly.
     """
-    if config_file.exists():
-        return config_file.read_text()
-    print("No custom rules TOML file found.")
-    return ""
+    try:
+        return config_file.read_bytes()
+    except FileNotFoundError:
+        # Diagnostics go to stderr, stdout may carry a piped commit message
+        sys.stderr.write("No custom rules TOML file found.\n")
+        return b""
 
 
+# Parsing is deterministic, so repeated messages (e.g. during a rebase or when
+# processing many commits at once) reuse the parsed details
+@lru_cache(maxsize=256)
 def extract_commit_details(
     commit_message: str,
-    base_pattern: str = BASE_PATTERN,
+    base_pattern: re.Pattern[str] = BASE_REGEX,
 ) -> CommitMessageDetails:
-    lines = commit_message.split("\n")
-    title = lines[0]
+    # Split off the title without building a list of all lines
+    title, _, body = commit_message.partition("\n")
 
-    if not (match := re.match(base_pattern, title)):
+    # A conventional prefix always ends with ":", so reject without the regex
+    if ":" not in title or not (match := base_pattern.match(title)):
         raise NonConventionalCommitError
 
+    # Fetch all groups in one call instead of one lookup per group
+    commit_type, scope, breaking = match.group("type", "scope", "breaking")
+    prefix_end = match.end()
+
     # Extract the conventional prefix and description from the title
-    conventional_prefix = title[: match.end()].strip()
-    description = title[match.end() :].strip()
+    # (the prefix is anchored at the start and ends with ":", so it has no
+    # surrounding whitespace to strip)
+    conventional_prefix = title[:prefix_end]
+    description = title[prefix_end:].strip()
 
-    # Extract the body from the rest of the lines
-    body = "\n".join(lines[1:]).strip()
+    # The body is the rest of the message after the title
+    body = body.strip()
 
     return CommitMessageDetails(
         conventional_prefix=conventional_prefix,
         description=description,
         body=body,
-        commit_type=match.group("type"),
-        scope=match.group("scope") if match.group("scope") else "",  # Handle None scope
-        breaking=bool(match.group("breaking")),
+        # Interned like the built-in type names, so dict lookups by type
+        # can match on identity before comparing strings
+        commit_type=sys.intern(commit_type),
+        scope=sys.intern(scope.strip()) if scope else "",  # Handle None scope
+        breaking=breaking is not None,
+    )
+
+
+def get_type_emoji(
+    details: CommitMessageDetails,
+    mappings: ConventionalEmojisConfig,
+) -> str:
+    if (type_emoji := mappings.types.get(details.commit_type)) is None:
+        raise NoConventionalCommitTypeFoundError(
+            commit_type=details.commit_type,
+            types=mappings.sorted_type_names,
+        )
+    return type_emoji
+
+
+def get_type_emojis(
+    details: CommitMessageDetails,
+    mappings: ConventionalEmojisConfig,
+    *,
+    enforce_scope_patterns: bool = False,  # noqa: ARG001 - same signature as get_emojis
+    disable_breaking_emoji: bool = False,
+) -> Emojis:
+    """Like ``get_emojis``, for configs without any scopes or combos."""
+    return Emojis(
+        type_emoji=get_type_emoji(details, mappings),
+        scope_emoji="",
+        breaking_emoji=mappings.config.breaking_emoji
+        if details.breaking and not disable_breaking_emoji
+        else "",
     )
 
 
@@ -156,49 +405,90 @@ def get_emojis(
     enforce_scope_patterns: bool = False,
     disable_breaking_emoji: bool = False,
 ) -> Emojis:
+    # The breaking emoji is the same whether or not a combo matches
+    breaking_emoji = (
+        mappings.config.breaking_emoji
+        if details.breaking and not disable_breaking_emoji
+        else ""
+    )
+
     # First check for combos
     if (
-        mappings.combos
-        and details.scope
-        and (combo_patterns := mappings.combos.get(details.commit_type)) is not None
+        details.scope
+        and (combo_patterns := mappings.compiled_combos.get(details.commit_type))
+        is not None
+        and (combo_emoji := combo_patterns.match(details.scope)) is not None
     ):
-        for pattern, emoji in combo_patterns.items():
-            if re.fullmatch(pattern, details.scope.strip()):
-                # If we find a matching combo, use its emoji as the type_emoji
-                # and set scope_emoji to empty string
-                return Emojis(
-                    type_emoji=emoji,
-                    scope_emoji="",
-                    breaking_emoji=mappings.config.breaking_emoji
-                    if details.breaking and not disable_breaking_emoji
-                    else "",
-                )
+        # If we find a matching combo, use its emoji as the type_emoji
+        # and set scope_emoji to empty string
+        return Emojis(
+            type_emoji=combo_emoji,
+            scope_emoji="",
+            breaking_emoji=breaking_emoji,
+        )
 
     # If no combo matches, proceed with regular type and scope emoji logic
-    if (type_emoji := mappings.types.get(details.commit_type)) is None:
-        msg = (
-            f"Commit type '{details.commit_type}' does not have a corresponding emoji.\n"
-            f"Available types are: {', '.join(sorted(mappings.types.keys()))}"
-        )
-        raise NoConventionalCommitTypeFoundError(msg)
+    type_emoji = get_type_emoji(details, mappings)
 
     scope_emoji = ""
-    if details.scope and mappings.scopes is not None:
-        for pattern, emoji in mappings.scopes.items():
-            if re.fullmatch(pattern, details.scope.strip()):
-                scope_emoji = emoji
-                break
-        else:  # no break - no matching pattern found
-            if enforce_scope_patterns:
-                msg = f"Scope '{details.scope}' does not match any defined patterns in the configuration."
-                raise UndefinedScopeError(msg)
+    if details.scope and (scope_patterns := mappings.compiled_scopes) is not None:
+        if (emoji := scope_patterns.match(details.scope)) is not None:
+            scope_emoji = emoji
+        elif enforce_scope_patterns:
+            msg = f"Scope '{details.scope}' does not match any defined patterns in the configuration."
+            raise UndefinedScopeError(msg)
 
     return Emojis(
         type_emoji=type_emoji,
         scope_emoji=scope_emoji,
-        breaking_emoji=mappings.config.breaking_emoji
-        if details.breaking and not disable_breaking_emoji
-        else "",
+        breaking_emoji=breaking_emoji,
+    )
+
+
+@lru_cache(maxsize=32)
+def parse_template(commit_template: str) -> tuple[TemplatePart, ...]:
+    """Parse a commit message template once into literal text and fields.
+
+    Args:
+        commit_template: Template in ``str.format`` syntax
+
+    Returns:
+        tuple[TemplatePart, ...]: Literal text, field name and, if the field has a
+            conversion or format spec, a single-field format string applying it
+            (nested fields in the spec, like ``{description:{body}}``, are kept)
+
+    Raises:
+        InvalidCommitTemplateError: If the template is not a valid format string or
+            contains unknown fields
+    """
+    try:
+        fields = list(Formatter().parse(commit_template))
+        field_names = [field_name for _, field_name, _, _ in fields] + [
+            nested_field_name
+            for _, _, format_spec, _ in fields
+            if format_spec
+            for _, nested_field_name, _, _ in Formatter().parse(format_spec)
+        ]
+    except ValueError as e:  # e.g. unbalanced braces
+        msg = f"Invalid commit template {commit_template}: {e}"
+        raise InvalidCommitTemplateError(msg) from e
+    if any(
+        field_name is not None and field_name not in TEMPLATE_FIELDS
+        for field_name in field_names
+    ):
+        msg = f"""Invalid commit template {commit_template}.
+        Make sure your template contains only these fields and no typos:
+        conventional_prefix, description, breaking_emoji, type_emoji, scope_emoji, body."""
+        raise InvalidCommitTemplateError(msg)
+    return tuple(
+        (
+            literal,
+            field_name,
+            "{" + (f"!{conversion}" if conversion else "") + f":{format_spec}}}"
+            if conversion or format_spec
+            else None,
+        )
+        for literal, field_name, format_spec, conversion in fields
     )
 
 
@@ -207,20 +497,23 @@ def update_commit_message(
     emojis: Emojis,
     commit_template: str,
 ) -> str:
-    try:
-        return commit_template.format(
-            conventional_prefix=details.conventional_prefix,
-            description=details.description,
-            breaking_emoji=emojis.breaking_emoji,
-            type_emoji=emojis.type_emoji,
-            scope_emoji=emojis.scope_emoji,
-            body=details.body,
-        )
-    except KeyError as e:
-        msg = f"""Invalid commit template {commit_template}.
-        Make sure your template contains only these fields and no typos:
-        conventional_prefix, description, breaking_emoji, type_emoji, scope_emoji, body."""
-        raise InvalidCommitTemplateError(msg) from e
+    values = {
+        "conventional_prefix": details.conventional_prefix,
+        "description": details.description,
+        "breaking_emoji": emojis.breaking_emoji,
+        "type_emoji": emojis.type_emoji,
+        "scope_emoji": emojis.scope_emoji,
+        "body": details.body,
+    }
+    parts = []
+    # The template is already validated, so every field has a value
+    for literal, field_name, spec in parse_template(commit_template):
+        parts.append(literal)
+        if field_name is not None:
+            value = values[field_name]
+            # Nested fields in the format spec are looked up by name
+            parts.append(value if spec is None else spec.format(value, **values))
+    return "".join(parts)
 
 
 def process_commit_message(
@@ -231,7 +524,7 @@ def process_commit_message(
     disable_breaking_emoji: bool = False,
 ) -> str:
     details = extract_commit_details(commit_message)
-    emojis = get_emojis(
+    emojis = config.emoji_resolver(
         details,
         config,
         enforce_scope_patterns=enforce_scope_patterns,
@@ -244,25 +537,72 @@ def process_commit_message(
     ).strip()
 
 
-def process_conventional_commit(
+def _report_error(error: Exception, commit_message: str) -> None:
+    """Report why a commit message could not be processed on stderr."""
+    if isinstance(error, ConventionalEmojisError):
+        sys.stderr.write(f"💥 Commit message: '{commit_message}'\n💥 {error}\n")
+    else:
+        sys.stderr.write(f"An unexpected error occurred: {error}\n")
+
+
+def rewrite_commit_message_file(
     commit_message_file: Path,
+    config: ConventionalEmojisConfig,
     *,
-    allow_types_as_scopes: bool,
-    config_file: Path = Path("conventional_emojis_config.yaml"),
-    template: str | None = None,
     enforce_scope_patterns: bool = False,
     disable_breaking_emoji: bool = False,
-) -> None:
-    toml_content = load_toml_content(config_file)
-    config = ConventionalEmojisConfig.from_toml(
-        toml_content=toml_content,
-        allow_types_as_scopes=allow_types_as_scopes,
-        template_override=template,
+) -> bool:
+    """Add emojis to the commit message in a file, in place.
+
+    Args:
+        commit_message_file: Path to the commit message file
+        config: Loaded configuration
+        enforce_scope_patterns: Whether scopes must match a defined pattern
+        disable_breaking_emoji: Whether to leave out the breaking change emoji
+
+    Returns:
+        bool: Whether the message was processed and the file has been updated
+    """
+    commit_message = ""
+    try:
+        # Read and rewrite the message through a single file handle
+        with commit_message_file.open("r+", encoding="utf-8") as file:
+            commit_message = file.read().strip()
+            processed_message = process_commit_message(
+                commit_message,
+                config,
+                enforce_scope_patterns=enforce_scope_patterns,
+                disable_breaking_emoji=disable_breaking_emoji,
+            )
+            # Only rewrite once processing succeeded, otherwise leave the file as is
+            file.seek(0)
+            file.truncate()
+            file.write(processed_message)
+    except Exception as e:
+        _report_error(e, commit_message)
+        return False
+
+    sys.stdout.write(
+        "🎉 Commit message follows Conventional Commits rules and has been updated with an emoji.\n",
     )
+    return True
+
+
+def pipe_commit_message(
+    config: ConventionalEmojisConfig,
+    *,
+    enforce_scope_patterns: bool = False,
+    disable_breaking_emoji: bool = False,
+) -> bool:
+    """Read a commit message from stdin and write it with emojis to stdout.
 
-    with commit_message_file.open("r") as file:
-        commit_message = file.read().strip()
+    Errors are reported on stderr, so only the processed message ends up on
+    stdout.
 
+    Returns:
+        bool: Whether the message was processed and written
+    """
+    commit_message = sys.stdin.read().strip()
     try:
         processed_message = process_commit_message(
             commit_message,
@@ -270,33 +610,230 @@ def process_conventional_commit(
             enforce_scope_patterns=enforce_scope_patterns,
             disable_breaking_emoji=disable_breaking_emoji,
         )
-        with commit_message_file.open("w") as file:
-            file.write(processed_message)
-        print(
-            "🎉 Commit message follows Conventional Commits rules and has been updated with an emoji.",
+    except Exception as e:
+        _report_error(e, commit_message)
+        return False
+
+    sys.stdout.write(processed_message + "\n")
+    return True
+
+
+def build_config(
+    config_file: Path,
+    *,
+    allow_types_as_scopes: bool = True,
+    template: str | None = None,
+) -> ConventionalEmojisConfig:
+    """Load the configuration file and prepare it for processing commits.
+
+    Args:
+        config_file: Path to the TOML configuration file
+        allow_types_as_scopes: Whether to include types as valid scopes
+        template: Optional template to override the configured one
+
+    Returns:
+        ConventionalEmojisConfig: Configuration with its template and patterns
+            already parsed and compiled
+
+    Note:
+        Configs loaded from an existing file are cached by the file's device,
+        inode, modification time and size, so repeated calls in one process
+        only decode and compile the file again once it has changed (a relative
+        path resolves to a different file after changing directories). Sharing the returned config is
+        safe, since configs are read-only. If the
+        ``CONVENTIONAL_EMOJIS_NO_CONFIG`` environment variable is set, the file
+        is not even looked up and the defaults are used.
+
+    Raises:
+        msgspec.ValidationError: If the TOML content is invalid
+        InvalidCommitTemplateError: If the commit message template is invalid
+    """
+    if os.environ.get(NO_CONFIG_ENV_VAR):
+        return ConventionalEmojisConfig.from_toml(
+            toml_content=b"",
+            allow_types_as_scopes=allow_types_as_scopes,
+            template_override=template,
+        )
+    try:
+        stat = config_file.stat()
+    except FileNotFoundError:
+        return ConventionalEmojisConfig.from_toml(
+            toml_content=load_toml_content(config_file),
+            allow_types_as_scopes=allow_types_as_scopes,
+            template_override=template,
+        )
+    return _build_cached_config(
+        config_file,
+        (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size),
+        allow_types_as_scopes=allow_types_as_scopes,
+        template=template,
+    )
+
+
+@lru_cache(maxsize=16)
+def _build_cached_config(
+    config_file: Path,
+    file_id: tuple[int, int, int, int],  # noqa: ARG001 - only part of the cache key
+    *,
+    allow_types_as_scopes: bool,
+    template: str | None,
+) -> ConventionalEmojisConfig:
+    return ConventionalEmojisConfig.from_toml(
+        toml_content=load_toml_content(config_file),
+        allow_types_as_scopes=allow_types_as_scopes,
+        template_override=template,
+    )
+
+
+def process_many(
+    commit_message_files: Iterable[Path],
+    config: ConventionalEmojisConfig,
+    *,
+    enforce_scope_patterns: bool = False,
+    disable_breaking_emoji: bool = False,
+) -> bool:
+    """Add emojis to many commit message files, sharing one loaded config.
+
+    Every file is processed even if an earlier one fails.
+
+    Returns:
+        bool: Whether all files were processed successfully
+    """
+    results = [
+        rewrite_commit_message_file(
+            commit_message_file,
+            config,
+            enforce_scope_patterns=enforce_scope_patterns,
+            disable_breaking_emoji=disable_breaking_emoji,
         )
-        sys.exit(0)
-    except (
-        NonConventionalCommitError,
-        NoConventionalCommitTypeFoundError,
-        UndefinedScopeError,
-        InvalidCommitTemplateError,
-    ) as e:
-        print(f"💥 Commit message: '{commit_message}'\n💥 {e}")
+        for commit_message_file in commit_message_files
+    ]
+    return all(results)
+
+
+def process_conventional_commits(
+    commit_message_files: Iterable[Path],
+    *,
+    allow_types_as_scopes: bool,
+    config_file: Path = Path("conventional_emojis_config.toml"),
+    template: str | None = None,
+    enforce_scope_patterns: bool = False,
+    disable_breaking_emoji: bool = False,
+) -> NoReturn:
+    """Process any number of commit message files with a single config load.
+
+    Exits with code 1 if the config could not be loaded or any file failed.
+    """
+    config = _build_config_or_exit(
+        config_file,
+        allow_types_as_scopes=allow_types_as_scopes,
+        template=template,
+    )
+    success = process_many(
+        commit_message_files,
+        config,
+        enforce_scope_patterns=enforce_scope_patterns,
+        disable_breaking_emoji=disable_breaking_emoji,
+    )
+    sys.exit(0 if success else 1)
+
+
+def process_piped_commit(
+    *,
+    allow_types_as_scopes: bool,
+    config_file: Path = Path("conventional_emojis_config.toml"),
+    template: str | None = None,
+    enforce_scope_patterns: bool = False,
+    disable_breaking_emoji: bool = False,
+) -> NoReturn:
+    """Add emojis to a commit message piped from stdin to stdout.
+
+    Exits with code 1 if the config could not be loaded or the message failed.
+    """
+    config = _build_config_or_exit(
+        config_file,
+        allow_types_as_scopes=allow_types_as_scopes,
+        template=template,
+    )
+    success = pipe_commit_message(
+        config,
+        enforce_scope_patterns=enforce_scope_patterns,
+        disable_breaking_emoji=disable_breaking_emoji,
+    )
+    sys.exit(0 if success else 1)
+
+
+def _build_config_or_exit(
+    config_file: Path,
+    *,
+    allow_types_as_scopes: bool,
+    template: str | None,
+) -> ConventionalEmojisConfig:
+    """Build the config, exiting with code 1 if that fails."""
+    try:
+        # The template is parsed while loading, so template errors surface here
+        return build_config(
+            config_file,
+            allow_types_as_scopes=allow_types_as_scopes,
+            template=template,
+        )
+    except InvalidCommitTemplateError as e:
+        sys.stderr.write(f"💥 {e}\n")
         sys.exit(1)
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        sys.stderr.write(f"An unexpected error occurred: {e}\n")
         sys.exit(1)
 
 
+def process_conventional_commit(
+    commit_message_file: Path,
+    *,
+    allow_types_as_scopes: bool,
+    config_file: Path = Path("conventional_emojis_config.yaml"),
+    template: str | None = None,
+    enforce_scope_patterns: bool = False,
+    disable_breaking_emoji: bool = False,
+) -> NoReturn:
+    process_conventional_commits(
+        [commit_message_file],
+        allow_types_as_scopes=allow_types_as_scopes,
+        config_file=config_file,
+        template=template,
+        enforce_scope_patterns=enforce_scope_patterns,
+        disable_breaking_emoji=disable_breaking_emoji,
+    )
+
+
 def main() -> None:
+    # A git hook usually passes just the commit message file, which needs no
+    # option parsing, so argparse is only imported when there is more to parse
+    argv = sys.argv[1:]
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        # Never returns, it always exits with the result
+        process_conventional_commits([Path(argv[0])], allow_types_as_scopes=True)
+
+    import argparse  # noqa: PLC0415
+
     parser = argparse.ArgumentParser(
         description="Process commit messages and add emojis.",
     )
     parser.add_argument(
-        "commit_message_file",
+        "commit_message_files",
+        metavar="commit_message_file",
         type=Path,
-        help="Path to the commit message file",
+        nargs="*",
+        help="Path to the commit message file (several files are processed with one config load), or - to read the message from stdin and write it to stdout",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Read commit message file paths from stdin (one per line) and process them all with one config load",
+    )
+    parser.add_argument(
+        "-z",
+        "--null",
+        action="store_true",
+        help="With --batch, read NUL-separated file paths (e.g. from git ... -z)",
     )
     parser.add_argument(
         "--config-file",
@@ -325,9 +862,38 @@ def main() -> None:
         help="Enforce scope to match defined patterns in settings",
     )
     args = parser.parse_args()
-
-    process_conventional_commit(
-        commit_message_file=args.commit_message_file,
+    if args.batch == bool(args.commit_message_files):
+        parser.error("pass either commit message files or --batch")
+    if STDIN in args.commit_message_files and len(args.commit_message_files) > 1:
+        parser.error("- cannot be combined with other commit message files")
+    if args.null and not args.batch:
+        parser.error("--null requires --batch")
+
+    # Paths are read lazily, so each file is processed as soon as it is listed.
+    # NUL-separated paths are taken verbatim, they may contain any whitespace.
+    if args.batch and args.null:
+        commit_message_files = (
+            Path(name) for name in sys.stdin.read().split("\0") if name
+        )
+    elif args.batch:
+        commit_message_files = (
+            Path(line.strip()) for line in sys.stdin if line.strip()
+        )
+    else:
+        commit_message_files = args.commit_message_files
+
+    # Only a positional - pipes the message, in batch mode stdin holds the paths
+    # and - is just another file name
+    if args.commit_message_files == [STDIN]:
+        process_piped_commit(
+            allow_types_as_scopes=not args.disable_types_as_scopes,
+            config_file=args.config_file,
+            template=args.template,
+            enforce_scope_patterns=args.enforce_scope_patterns,
+            disable_breaking_emoji=args.disable_breaking_emoji,
+        )
+    process_conventional_commits(
+        commit_message_files,
         allow_types_as_scopes=not args.disable_types_as_scopes,
         config_file=args.config_file,
         template=args.template,
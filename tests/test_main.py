@@ -1,3 +1,10 @@
+import copy
+import io
+import os
+import pickle
+from pathlib import Path
+
+import msgspec
 import pytest
 
 from conventional_emojis.constants import (
@@ -12,12 +19,22 @@ from conventional_emojis.exceptions import (
     UndefinedScopeError,
 )
 from conventional_emojis.main import (
+    DEFAULT_CONFIG,
     CommitMessageDetails,
     ConventionalEmojisConfig,
     Emojis,
+    PatternMatcher,
+    build_config,
     extract_commit_details,
     get_emojis,
+    get_type_emojis,
+    main,
+    pipe_commit_message,
     process_commit_message,
+    process_conventional_commits,
+    process_many,
+    process_piped_commit,
+    rewrite_commit_message_file,
     update_commit_message,
 )
 
@@ -122,6 +139,66 @@ class TestConfigLoading:
         assert config.config.breaking_emoji == BREAKING
         assert config.config.commit_message_template == COMMIT_MESSAGE_TEMPLATE
 
+    def test_empty_config_is_shared(self):
+        """Test that loading without any configuration reuses the default config."""
+        config = ConventionalEmojisConfig.from_toml("")
+        assert ConventionalEmojisConfig.from_toml(b"") is config
+        overridden = ConventionalEmojisConfig.from_toml("", template_override="{body}")
+        assert overridden is not config
+        with pytest.raises(TypeError):
+            config.types["foo"] = "F"
+        with pytest.raises(AttributeError):
+            config.config.breaking_emoji = "X"
+        assert "foo" not in ConventionalEmojisConfig.from_toml("").types
+
+    def test_config_does_not_share_default_types(self):
+        """Test that no config aliases the module-level COMMIT_TYPES dict."""
+        assert ConventionalEmojisConfig.from_toml("").types is not COMMIT_TYPES
+        config = ConventionalEmojisConfig.from_toml("", template_override="{body}")
+        assert config.types is not COMMIT_TYPES
+
+    def test_loaded_config_is_read_only(self, basic_config):
+        """Test that the patterns a config was compiled from cannot change."""
+        assert basic_config.scopes is not None
+        assert basic_config.combos is not None
+        with pytest.raises(TypeError):
+            basic_config.scopes["web"] = "🌐"
+        with pytest.raises(TypeError):
+            basic_config.combos["feat"]["web"] = "🌐"
+        with pytest.raises(AttributeError):
+            basic_config.scopes = {}
+        with pytest.raises(AttributeError):
+            basic_config.config.breaking_emoji = "X"
+
+    def test_loaded_config_round_trips(self, basic_config):
+        """Test that a read-only config still encodes, pickles and copies."""
+        encoded = msgspec.json.encode(basic_config)
+        assert msgspec.json.decode(encoded, type=ConventionalEmojisConfig) == (
+            basic_config
+        )
+        assert msgspec.to_builtins(basic_config)["types"] == basic_config.types
+        unpickled = pickle.loads(pickle.dumps(basic_config))  # noqa: S301
+        assert unpickled == basic_config
+        assert process_commit_message("feat(api): x", unpickled) == "🚀 feat(api): x"
+        with pytest.raises(TypeError):
+            unpickled.scopes["web"] = "🌐"
+        assert copy.deepcopy(basic_config) == basic_config
+
+    def test_replaced_config_recompiles_patterns(self, basic_config):
+        """Test that a config derived with new scopes matches those scopes."""
+        assert basic_config.scopes is not None
+        config = msgspec.structs.replace(
+            basic_config,
+            scopes={**basic_config.scopes, "web": "🌐"},
+        )
+        assert process_commit_message("fix(web): x", config) == "🙌🌐 fix(web): x"
+
+    def test_custom_type_keys_interned(self):
+        """Test that custom type keys are the same objects as parsed types."""
+        config = ConventionalEmojisConfig.from_toml('[types]\nrelease = "🚀"')
+        commit_type = extract_commit_details("release: v1").commit_type
+        assert next(key for key in config.types if key == "release") is commit_type
+
     def test_template_override(self):
         """Test that template override works correctly."""
         custom_template = "{breaking_emoji}{conventional_prefix}{type_emoji}{scope_emoji} {description}\n{body}"
@@ -152,6 +229,29 @@ class TestExtractCommitDetails:
         assert details.commit_type == "feat"
         assert details.scope == "api"
 
+    def test_extract_commit_details_strips_scope(self):
+        details = extract_commit_details("feat( api ): add new endpoint")
+        assert details.scope == "api"
+        assert details.conventional_prefix == "feat( api ):"
+
+    def test_extract_commit_details_scope_ends_at_first_paren(self):
+        details = extract_commit_details("fix(ui): handle (edge): case")
+        assert details.scope == "ui"
+        assert details.conventional_prefix == "fix(ui):"
+        assert details.description == "handle (edge): case"
+
+    def test_extract_commit_details_rejects_nested_scope_parens(self):
+        """Test that a scope cannot contain parentheses (it ends at the first ")")."""
+        with pytest.raises(NonConventionalCommitError):
+            extract_commit_details("fix(a(b)): c")
+
+    def test_extract_commit_details_cached(self):
+        """Test that parsing the same message twice reuses the parsed details."""
+        commit_message = "fix(ui): align button"
+        assert extract_commit_details(commit_message) is extract_commit_details(
+            commit_message,
+        )
+
     def test_extract_invalid_commit_format(self):
         with pytest.raises(NonConventionalCommitError):
             extract_commit_details("invalid commit message")
@@ -262,8 +362,45 @@ class TestGetEmojis:
             scope="api",
             breaking=False,
         )
-        with pytest.raises(NoConventionalCommitTypeFoundError):
+        with pytest.raises(NoConventionalCommitTypeFoundError) as exc_info:
             get_emojis(details, basic_config)
+        assert str(exc_info.value).startswith(
+            "Commit type 'invalid' does not have a corresponding emoji.\n"
+            "Available types are: build, chore, ci, config, docs, feat,",
+        )
+        assert exc_info.value.types == basic_config.sorted_type_names
+        assert exc_info.value.args == (str(exc_info.value),)
+
+    def test_invalid_type_error_with_message(self):
+        """Test that the type error takes a message first, like the others."""
+        assert str(NoConventionalCommitTypeFoundError("custom")) == "custom"
+        assert str(NoConventionalCommitTypeFoundError()) == (
+            "Commit type not found in the commit types."
+        )
+        error = NoConventionalCommitTypeFoundError(
+            commit_type="x",
+            types=iter(["a", "b"]),
+        )
+        # Rendering twice must not exhaust the iterator
+        for _ in range(2):
+            assert str(error).endswith("Available types are: a, b")
+
+    def test_type_only_config(self):
+        """Test that configs without scopes and combos use the type-only lookup."""
+        config = ConventionalEmojisConfig.from_toml('[types]\nfeat = "🔥"')
+        assert config.emoji_resolver is get_type_emojis
+        details = CommitMessageDetails(
+            conventional_prefix="feat(api)!",
+            description="test",
+            body="",
+            commit_type="feat",
+            scope="api",
+            breaking=True,
+        )
+        assert get_type_emojis(details, config) == get_emojis(details, config)
+
+    def test_pattern_config_uses_full_lookup(self, basic_config):
+        assert basic_config.emoji_resolver is get_emojis
 
     # Test Scope Pattern Enforcement
     def test_enforce_scope_patterns(self, basic_config):
@@ -279,6 +416,50 @@ class TestGetEmojis:
             get_emojis(details, basic_config, enforce_scope_patterns=True)
 
 
+##### Pattern Matching #####
+
+
+class TestPatternMatcher:
+    @pytest.mark.parametrize(
+        "patterns",
+        [
+            {"a.*": "🅰️", "api": "🔌", "ui|frontend": "🎨"},  # fused alternation
+            {"(a).*": "🅰️", "api": "🔌", "ui|frontend": "🎨"},  # capturing group
+            {"(?i)A.*": "🅰️", "api": "🔌", "ui|frontend": "🎨"},  # global flag
+        ],
+    )
+    def test_first_matching_pattern_wins(self, patterns: dict[str, str]):
+        """Test that patterns are matched in order, fused or not."""
+        matcher = PatternMatcher.from_patterns(patterns)
+        assert matcher.match("api") == "🅰️"
+        assert matcher.match("frontend") == "🎨"
+        assert matcher.match("backend") is None
+
+    def test_patterns_are_fused(self):
+        """Test that regex patterns are combined into a single regex."""
+        assert PatternMatcher.from_patterns({"api.*": "🔌", "g?ui": "🎨"}).regex
+        assert PatternMatcher.from_patterns({"(api)": "🔌"}).regex is None
+
+    def test_literal_patterns(self):
+        """Test that plain names are looked up without running a regex."""
+        matcher = PatternMatcher.from_patterns({"api": "🔌", "ui": "🎨"})
+        assert matcher.literals == {"api": 0, "ui": 1}
+        assert matcher.regex is None
+        assert matcher.match("ui") == "🎨"
+        assert matcher.match("") is None
+
+    @pytest.mark.parametrize(
+        ("scope", "expected"),
+        [("api", "🅰️"), ("app", "🅰️"), ("db", "📦"), ("core", "🐍")],
+    )
+    def test_literal_and_regex_order(self, scope: str, expected: str):
+        """Test that literals do not take precedence over earlier regex patterns."""
+        matcher = PatternMatcher.from_patterns(
+            {"db": "📦", "a.*": "🅰️", "api": "🔌", "app": "📱", "co.e": "🐍"},
+        )
+        assert matcher.match(scope) == expected
+
+
 ##### Update Commit Message #####
 
 
@@ -310,6 +491,50 @@ class TestUpdateCommitMessage:
         with pytest.raises(InvalidCommitTemplateError):
             update_commit_message(details, emojis, "{invalid}")
 
+    def test_update_commit_message_format_spec(self):
+        """Test that conversions and format specs in the template are applied."""
+        details = CommitMessageDetails(
+            conventional_prefix="feat(api):",
+            description="test",
+            body="",
+            commit_type="feat",
+            scope="api",
+            breaking=False,
+        )
+        emojis = Emojis(type_emoji="🔥", scope_emoji="", breaking_emoji="")
+        template = "{{{type_emoji:>2}}} {conventional_prefix} {description!r}"
+        result = update_commit_message(details, emojis, template)
+        assert result == "{ 🔥} feat(api): 'test'"
+
+    def test_template_with_nested_format_spec(self):
+        """Test that fields nested in a format spec are filled in."""
+        details = CommitMessageDetails(
+            conventional_prefix="feat:",
+            description="test",
+            body=">6",
+            commit_type="feat",
+            scope="",
+            breaking=False,
+        )
+        emojis = Emojis(type_emoji="🔥", scope_emoji="", breaking_emoji="")
+        config = ConventionalEmojisConfig.from_toml(
+            "",
+            template_override="{description:{body}}",
+        )
+        template = config.config.commit_message_template
+        assert update_commit_message(details, emojis, template) == "  test"
+
+    @pytest.mark.parametrize("template", ["{description:{bdy}}", "{description:{}}"])
+    def test_template_with_unknown_nested_field(self, template: str):
+        """Test that unknown fields nested in a format spec are rejected at load."""
+        with pytest.raises(InvalidCommitTemplateError):
+            ConventionalEmojisConfig.from_toml("", template_override=template)
+
+    def test_malformed_template(self):
+        """Test that an error is raised when loading a template with unbalanced braces."""
+        with pytest.raises(InvalidCommitTemplateError):
+            ConventionalEmojisConfig.from_toml("", template_override="{description")
+
 
 ##### Full Messages #####
 
@@ -408,13 +633,232 @@ class TestCustomTemplates:
         assert result == "🔥🎨 feat(ui)!: add new feature"
 
     def test_template_with_typo(self, basic_toml: str):
-        """Test that an error is raised for an invalid template with a typo (prefix -> prefiz)."""
+        """Test that an error is raised when loading a template with a typo (prefix -> prefiz)."""
         custom_template = (
             "{type_emoji}{scope_emoji} {conventional_prefiz} {description}\n{body}"
         )
-        config = ConventionalEmojisConfig.from_toml(
-            basic_toml,
-            template_override=custom_template,
-        )
         with pytest.raises(InvalidCommitTemplateError):
-            process_commit_message("feat(ui): add new feature", config)
+            ConventionalEmojisConfig.from_toml(
+                basic_toml,
+                template_override=custom_template,
+            )
+
+
+##### Commit Message Files #####
+
+
+class TestCommitMessageFiles:
+    def test_rewrite_commit_message_file(self, tmp_path: Path, basic_config):
+        """Test that a conventional commit message file is rewritten in place."""
+        commit_message_file = tmp_path / "COMMIT_EDITMSG"
+        commit_message_file.write_text("feat(ui): add button\n\nDetails here\n")
+        assert rewrite_commit_message_file(commit_message_file, basic_config)
+        assert (
+            commit_message_file.read_text()
+            == "🔥🎨 feat(ui): add button\n\nDetails here"
+        )
+
+    def test_rewrite_invalid_commit_message_file(self, tmp_path: Path, basic_config):
+        """Test that a non-conventional commit message file is left untouched."""
+        commit_message_file = tmp_path / "COMMIT_EDITMSG"
+        commit_message_file.write_text("invalid message\n")
+        assert not rewrite_commit_message_file(commit_message_file, basic_config)
+        assert commit_message_file.read_text() == "invalid message\n"
+
+    def test_rewrite_reports_errors_on_stderr(
+        self,
+        tmp_path: Path,
+        basic_config,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that success is reported on stdout and failures on stderr."""
+        valid_file, invalid_file = tmp_path / "valid", tmp_path / "invalid"
+        valid_file.write_text("feat: one")
+        invalid_file.write_text("invalid")
+        assert rewrite_commit_message_file(valid_file, basic_config)
+        assert not rewrite_commit_message_file(invalid_file, basic_config)
+        captured = capsys.readouterr()
+        assert captured.out.startswith("🎉")
+        assert captured.err.startswith("💥 Commit message: 'invalid'")
+
+    def test_process_many_commit_message_files(self, tmp_path: Path):
+        """Test that all files are processed and any failure sets the exit code."""
+        files = [tmp_path / name for name in ("first", "second", "third")]
+        for file, message in zip(
+            files,
+            ["feat: one", "invalid", "fix: three"],
+            strict=True,
+        ):
+            file.write_text(message)
+        with pytest.raises(SystemExit) as exc_info:
+            process_conventional_commits(
+                files,
+                allow_types_as_scopes=True,
+                config_file=tmp_path / "missing.toml",
+            )
+        assert exc_info.value.code == 1
+        assert [file.read_text() for file in files] == [
+            "feat: ✨ one",
+            "invalid",
+            "fix: 🐛 three",
+        ]
+
+    def test_build_config_cached_until_file_changes(
+        self,
+        tmp_path: Path,
+        basic_toml: str,
+    ):
+        """Test that an unchanged config file is only loaded once."""
+        config_file = tmp_path / "conventional_emojis_config.toml"
+        config_file.write_text(basic_toml)
+        config = build_config(config_file)
+        assert build_config(config_file) is config
+        with pytest.raises(TypeError):
+            config.types["foo"] = "F"
+        assert build_config(config_file, template="{body}") is not config
+        config_file.write_text(basic_toml.replace('ui = "🎨"', 'web = "🌐"'))
+        changed = build_config(config_file)
+        assert changed is not config
+        assert changed.scopes is not None
+        assert "web" in changed.scopes
+
+    def test_build_config_cache_follows_working_directory(
+        self,
+        tmp_path: Path,
+        basic_toml: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that a relative config path is not cached across directories."""
+        first, second = tmp_path / "first", tmp_path / "second"
+        first.mkdir()
+        second.mkdir()
+        config_file = Path("conventional_emojis_config.toml")
+        (first / config_file).write_text(basic_toml)
+        (second / config_file).write_text(basic_toml.replace("🚀", "🛸"))
+        # Same size and modification time, only the file itself differs
+        mtime_ns = (first / config_file).stat().st_mtime_ns
+        os.utime(second / config_file, ns=(mtime_ns, mtime_ns))
+        monkeypatch.chdir(first)
+        assert build_config(config_file).combos["feat"]["api"] == "🚀"
+        monkeypatch.chdir(second)
+        assert build_config(config_file).combos["feat"]["api"] == "🛸"
+
+    def test_build_config_without_config_lookup(
+        self,
+        tmp_path: Path,
+        basic_toml: str,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that the no-config environment variable ignores the config file."""
+        config_file = tmp_path / "conventional_emojis_config.toml"
+        config_file.write_text(basic_toml)
+        monkeypatch.setenv("CONVENTIONAL_EMOJIS_NO_CONFIG", "1")
+        assert build_config(config_file) is DEFAULT_CONFIG
+
+    def test_process_many_with_built_config(self, tmp_path: Path, basic_toml: str):
+        """Test that a config built from a file is shared across many files."""
+        config_file = tmp_path / "conventional_emojis_config.toml"
+        config_file.write_text(basic_toml)
+        config = build_config(config_file)
+        files = [tmp_path / "first", tmp_path / "second"]
+        files[0].write_text("feat(api): one")
+        files[1].write_text("chore(lint): two")
+        assert process_many(files, config)
+        assert [file.read_text() for file in files] == [
+            "🚀 feat(api): one",
+            "☝️🤓 chore(lint): two",
+        ]
+
+    def test_pipe_commit_message(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that - reads the message from stdin and writes it to stdout."""
+        monkeypatch.setenv("CONVENTIONAL_EMOJIS_NO_CONFIG", "1")
+        monkeypatch.setattr("sys.argv", ["conventional-emojis", "-"])
+        monkeypatch.setattr("sys.stdin", io.StringIO("feat(api): piped\n"))
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+        captured = capsys.readouterr()
+        assert captured.out == "feat(api): ✨ piped\n"
+        assert captured.err == ""
+
+    def test_process_piped_commit(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that the pipe entry point loads the config and exits with the result."""
+        config_file = tmp_path / "conventional_emojis_config.toml"
+        config_file.write_text('[types]\nfeat = "🚀"')
+        monkeypatch.setattr("sys.stdin", io.StringIO("feat: piped"))
+        with pytest.raises(SystemExit) as exc_info:
+            process_piped_commit(allow_types_as_scopes=True, config_file=config_file)
+        assert exc_info.value.code == 0
+        assert capsys.readouterr().out == "feat: 🚀 piped\n"
+
+    def test_pipe_commit_message_error(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ):
+        """Test that a failing piped message reports only on stderr."""
+        monkeypatch.setattr("sys.stdin", io.StringIO("invalid"))
+        assert not pipe_commit_message(DEFAULT_CONFIG)
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "does not follow Conventional Commits rules" in captured.err
+
+    def test_main_single_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that a plain hook invocation processes the file without options."""
+        commit_message_file = tmp_path / "COMMIT_EDITMSG"
+        commit_message_file.write_text("fix: bug")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            "sys.argv",
+            ["conventional-emojis", str(commit_message_file)],
+        )
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+        assert commit_message_file.read_text() == "fix: 🐛 bug"
+
+    def test_main_batch_null_separated(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that --batch --null reads NUL-separated paths from stdin."""
+        files = [tmp_path / "first message", tmp_path / "second\nmessage"]
+        files[0].write_text("feat: one")
+        files[1].write_text("fix: two")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.argv", ["conventional-emojis", "--batch", "-z"])
+        monkeypatch.setattr(
+            "sys.stdin",
+            io.StringIO("".join(f"{file}\0" for file in files)),
+        )
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+        assert [file.read_text() for file in files] == ["feat: ✨ one", "fix: 🐛 two"]
+
+    def test_main_batch_dash_is_a_file(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that - among batch paths is a file name, not a pipe."""
+        files = [tmp_path / "one", tmp_path / "-", tmp_path / "two"]
+        for file in files:
+            file.write_text("feat: x")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.argv", ["conventional-emojis", "--batch"])
+        monkeypatch.setattr("sys.stdin", io.StringIO("one\n-\ntwo\n"))
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+        assert [file.read_text() for file in files] == ["feat: ✨ x"] * 3